@@ -1,8 +1,11 @@
 -- Run once against the weave_weather database to add missing indexes.
--- Each CREATE INDEX is CONCURRENT-safe (no table lock on Postgres 9.5+).
+-- Each CREATE INDEX is CONCURRENT-safe (no table lock on Postgres 9.5+), except
+-- those on the partitioned forecast_data table (see below).
 
--- forecast_data: observation time-range + spatial queries
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_forecast_data_run_var_latlon
+-- forecast_data: observation time-range + spatial queries.
+-- forecast_data is partitioned (schema.sql), and Postgres can't build or drop
+-- indexes CONCURRENTLY on a partitioned parent, so its statements are plain.
+CREATE INDEX IF NOT EXISTS idx_forecast_data_run_var_latlon
     ON forecast_data(run_id, variable_id, latitude, longitude);
 
 -- observation_data: time + spatial lookups used by SSR / correlation
@@ -23,3 +26,24 @@ CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_regridded_obs_src_time_latlon
 -- forecast_runs: foreign key + latest-run ORDER BY queries
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_forecast_runs_model_time
     ON forecast_runs(model_id, initialization_time DESC);
+
+-- forecast_data / ensemble_statistics: covering indexes for the grid endpoints
+-- (/api/forecast-data, /api/wind-data). Key columns match their WHERE clauses
+-- and INCLUDE carries every selected column, so the grid read is index-only.
+CREATE INDEX IF NOT EXISTS idx_fd_run_var_hr_mem
+    ON forecast_data(run_id, variable_id, forecast_hour, ensemble_member)
+    INCLUDE (latitude, longitude, value);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_es_run_var_hr
+    ON ensemble_statistics(run_id, variable_id, forecast_hour)
+    INCLUDE (latitude, longitude, mean_value, std_dev);
+
+-- Superseded by the covering indexes above (same leading key columns); dropping
+-- them saves a write per inserted row during loads.
+DROP INDEX IF EXISTS idx_forecast_data_run_var_hour;
+DROP INDEX IF EXISTS idx_forecast_data_run_var_hour_member;
+DROP INDEX CONCURRENTLY IF EXISTS idx_ensemble_stats_run_var_hour;
+
+-- Refresh planner stats and the visibility map (index-only scans depend on it).
+VACUUM ANALYZE forecast_data;
+VACUUM ANALYZE ensemble_statistics;
@@ -0,0 +1,31 @@
+"""
+Invalidate the Flask API's response cache after a loader commits new data.
+
+Only a shared Redis cache (CACHE_REDIS_URL) can be invalidated from another
+process. Without it the API falls back to per-worker SimpleCache and entries
+just expire after CACHE_LOCAL_TIMEOUT (5 minutes by default).
+"""
+import os
+
+from dotenv import load_dotenv
+load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
+
+
+def invalidate_api_cache():
+    """Delete every cached API response. Returns the number of keys removed."""
+    redis_url = os.environ.get('CACHE_REDIS_URL')
+    if not redis_url:
+        return 0
+    try:
+        import redis
+    except ImportError:
+        print("⚠️ redis not installed — API response cache not invalidated")
+        return 0
+
+    prefix = os.environ.get('CACHE_KEY_PREFIX', 'weave:')
+    client = redis.Redis.from_url(redis_url)
+    keys   = list(client.scan_iter(match=prefix + '*', count=1000))
+    if keys:
+        client.delete(*keys)
+    print(f"🧹 Invalidated {len(keys)} cached API responses")
+    return len(keys)
@@ -5,7 +5,10 @@ from psycopg2.extras import RealDictCursor
 import math
 import io
 import base64
+import logging
 import os
+import time
+from contextlib import contextmanager
 from datetime import timedelta
 import scipy.stats
 
@@ -22,12 +25,63 @@ import numpy as np
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 
+# Per-request logging goes through app.logger, not print(): at the default
+# WARNING level the hot-path INFO lines cost almost nothing and never touch
+# stdout. LOG_LEVEL=INFO brings them back.
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'WARNING').upper(),
+                    format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
 app = Flask(__name__)
 # Cap request bodies so a malformed/oversized POST can't exhaust memory.
 app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
 CORS(app, origins=os.environ.get('CORS_ORIGIN', 'http://localhost:3000'))
 
 
+# ── JSON serialisation ────────────────────────────────────────────────────────
+# Grid endpoints return tens of thousands of points per response; orjson
+# serialises them several times faster than the stdlib encoder and handles
+# NumPy arrays/scalars natively. Falls back to Flask's default provider if
+# orjson isn't installed.
+try:
+    import orjson
+    from datetime import date
+    from decimal import Decimal
+    from flask.json.provider import JSONProvider
+    from werkzeug.http import http_date
+
+    _ORJSON_OPTS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                    | orjson.OPT_PASSTHROUGH_DATETIME)
+
+    def _orjson_default(o):
+        # Mirrors Flask's DefaultJSONProvider, except Decimal → number.
+        if isinstance(o, Decimal):
+            return float(o)
+        if isinstance(o, date):
+            return http_date(o)
+        if hasattr(o, '__html__'):
+            return str(o.__html__())
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    class OrjsonProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=_ORJSON_OPTS, default=_orjson_default).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            # Hand the bytes straight to the response; skips a decode/encode.
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(
+                orjson.dumps(obj, option=_ORJSON_OPTS, default=_orjson_default),
+                mimetype='application/json',
+            )
+
+    app.json = OrjsonProvider(app)
+except ImportError:  # pragma: no cover
+    print("⚠️  orjson not installed — using Flask's default JSON encoder")
+
+
 # ── JSON error responses ──────────────────────────────────────────────────────
 # API clients always expect JSON. These ensure a malformed request or an
 # uncaught exception returns a clean JSON body (not Werkzeug's HTML page /
@@ -66,6 +120,101 @@ except Exception as _e:  # pragma: no cover
     print(f"⚠️  Rate limiting disabled: {_e}")
 
 
+# ── Response caching ──────────────────────────────────────────────────────────
+# Grid responses are static for a given query string until a loader lands a new
+# run, so the whole response is cached. Set CACHE_REDIS_URL=redis://… to share
+# one cache across gunicorn workers and let the loaders invalidate it (see
+# api_cache.py); otherwise each worker keeps its own SimpleCache, which nothing
+# can invalidate, so its entries expire after CACHE_LOCAL_TIMEOUT at most — a
+# grid cached while a run was still loading doesn't outlive the load for long.
+# No-op if flask-caching isn't installed.
+CACHE_REDIS_URL  = os.environ.get('CACHE_REDIS_URL')
+CACHE_TIMEOUT    = int(os.environ.get('CACHE_TIMEOUT', 3600))
+if not CACHE_REDIS_URL:
+    CACHE_TIMEOUT = min(CACHE_TIMEOUT, int(os.environ.get('CACHE_LOCAL_TIMEOUT', 300)))
+CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX', 'weave:')
+
+def _cacheable(rv):
+    # Never cache a 404 / 500 — the data may land on the next loader run — nor
+    # an empty grid (g.skip_cache): the latest run exists but is still loading.
+    if g.get('skip_cache'):
+        return False
+    status = rv[1] if isinstance(rv, tuple) else getattr(rv, 'status_code', 200)
+    return status == 200
+
+try:
+    from flask_caching import Cache
+    cache = Cache(app, config={
+        'CACHE_TYPE':            'RedisCache' if CACHE_REDIS_URL else 'SimpleCache',
+        'CACHE_REDIS_URL':       CACHE_REDIS_URL,
+        'CACHE_KEY_PREFIX':      CACHE_KEY_PREFIX,
+        'CACHE_DEFAULT_TIMEOUT': CACHE_TIMEOUT,
+    })
+    cache_response = cache.cached(timeout=CACHE_TIMEOUT, query_string=True,
+                                  response_filter=_cacheable)
+except Exception as _e:  # pragma: no cover
+    cache = None
+    def cache_response(f):
+        return f
+    print(f"⚠️  Response caching disabled: {_e}")
+
+
+# ── Neighbour-hour prefetch ───────────────────────────────────────────────────
+# The timeline scrubs through forecast hours in order, so whenever a grid
+# endpoint serves hour H — cache hit or miss, hence it wraps cache_response —
+# H ± PREFETCH_HOUR_STEP are rendered in the background through the same cached
+# view; the next click is then a hit. cache.add() is set-if-absent, so repeat
+# hits, concurrent clients (and workers, with Redis) don't prime an hour twice.
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+# Each prefetch worker holds a pooled DB connection while it renders, so size
+# DB_POOL_MAX for worker-connections + PREFETCH_WORKERS (see DEPLOY.md).
+PREFETCH_HOUR_STEP = int(os.environ.get('PREFETCH_HOUR_STEP', 6))
+PREFETCH_WORKERS   = int(os.environ.get('PREFETCH_WORKERS', 2))
+_prefetch_pool     = ThreadPoolExecutor(max_workers=max(PREFETCH_WORKERS, 1),
+                                        thread_name_prefix='prefetch')
+
+
+def _prime_cache(view, path, args, guard):
+    try:
+        with app.test_request_context(path, query_string=args):
+            g.is_prefetch = True
+            view()
+            if g.get('skip_cache'):
+                # Nothing was cached (the hour is still loading) — let a later
+                # request prime it again.
+                cache.delete(guard)
+    except Exception as e:
+        app.logger.warning("⚠️  Prefetch %s %s failed: %s", path, args, e)
+
+
+def prefetch_neighbour_hours(f):
+    if cache is None or PREFETCH_HOUR_STEP <= 0 or PREFETCH_WORKERS <= 0:
+        return f
+
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        rv = f(*args, **kwargs)
+        if g.get('is_prefetch') or not _cacheable(rv):
+            return rv
+        try:
+            hour = int(request.args.get('hour', 6))
+        except (TypeError, ValueError):
+            return rv
+        view = app.view_functions[request.endpoint]
+        for h in (hour + PREFETCH_HOUR_STEP, hour - PREFETCH_HOUR_STEP):
+            if h < 0:
+                continue
+            params = {**request.args.to_dict(), 'hour': str(h)}
+            guard  = 'prefetch:' + request.path + '?' + '&'.join(
+                f'{k}={v}' for k, v in sorted(params.items()))
+            if cache.add(guard, 1, timeout=CACHE_TIMEOUT):
+                _prefetch_pool.submit(_prime_cache, view, request.path, params, guard)
+        return rv
+    return decorated
+
+
 # ── Lightweight input allowlist ───────────────────────────────────────────────
 # Queries are parameterised (injection-safe); this is defence-in-depth + a clean
 # 400 for obviously-malformed model/variable tokens instead of an empty result.
@@ -86,42 +235,113 @@ import psycopg2.pool
 
 # ThreadedConnectionPool is safe for multi-threaded Flask serving.
 # Min=5 pre-warms connections at startup so the first requests don't pay
-# connection setup cost. Max=20 handles bursts (region analysis fires ~10
-# concurrent requests).
+# connection setup cost. Max=22 covers gunicorn's 20 worker-connections plus
+# the 2 prefetch threads (see DEPLOY.md), and 4 workers × 22 stays under
+# Postgres's default max_connections of 100.
 connection_pool = psycopg2.pool.ThreadedConnectionPool(
     int(os.environ.get('DB_POOL_MIN', 5)),
-    int(os.environ.get('DB_POOL_MAX', 30)),
+    int(os.environ.get('DB_POOL_MAX', 22)),
     **DB_CONFIG
 )
 
 
-def get_db_connection():
-    return connection_pool.getconn()
+def get_db():
+    """The request's pooled connection. Borrowed on first use — so cache hits
+    never touch the pool — and shared by every query the request runs; close_db()
+    returns it when the app context ends."""
+    if 'db' not in g:
+        g.db = connection_pool.getconn()
+    return g.db
+
+
+@app.teardown_appcontext
+def close_db(exc=None):
+    # putconn() rolls back any open transaction, so read-only endpoints never
+    # leave an idle-in-transaction connection holding a pool slot.
+    conn = g.pop('db', None)
+    if conn is not None:
+        connection_pool.putconn(conn)
+
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection outside a request (e.g. warmup()); it goes
+    back to the pool even if the body raises."""
+    conn = connection_pool.getconn()
+    try:
+        yield conn
+    finally:
+        connection_pool.putconn(conn)
+
+
+# ── ID lookup caches ──────────────────────────────────────────────────────────
+# models/variables are reference tables that only change with a schema edit, so
+# their IDs are resolved once per process instead of by a scalar subquery on
+# every request. The latest run per model does move (each loader run adds one),
+# so that lookup is cached across requests with a short TTL.
+_MODEL_IDS    = {}
+_VARIABLE_IDS = {}
+_RUN_IDS      = {}   # model_name -> (run_id, expires_at)
+RUN_ID_TTL    = int(os.environ.get('RUN_ID_CACHE_TTL', 300))
+
+
+def _load_id_maps(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT model_name, model_id FROM models")
+        _MODEL_IDS.update(cur.fetchall())
+        cur.execute("SELECT variable_name, variable_id FROM variables")
+        _VARIABLE_IDS.update(cur.fetchall())
+
+
+def warmup():
+    """Populate the model/variable ID caches before serving traffic."""
+    with db_connection() as conn:
+        _load_id_maps(conn)
+
+
+def get_model_id(cursor, model_name):
+    if model_name not in _MODEL_IDS:
+        _load_id_maps(cursor.connection)
+    return _MODEL_IDS.get(model_name)
 
 
-def return_db_connection(conn):
-    connection_pool.putconn(conn)
+def get_variable_id(cursor, variable_name):
+    if variable_name not in _VARIABLE_IDS:
+        _load_id_maps(cursor.connection)
+    return _VARIABLE_IDS.get(variable_name)
 
 
 def get_model_run_id(cursor, model_name):
     # Cache per-request in Flask g so repeated calls within the same HTTP
-    # request (e.g. multiple dispatch functions) hit the DB only once.
+    # request (e.g. multiple dispatch functions) always agree on one run.
     cache = g.get('run_id_cache')
     if cache is None:
         g.run_id_cache = {}
         cache = g.run_id_cache
     if model_name in cache:
         return cache[model_name]
-    cursor.execute("""
-        SELECT fr.run_id
-        FROM forecast_runs fr
-        JOIN models m ON fr.model_id = m.model_id
-        WHERE m.model_name = %s
-        ORDER BY fr.initialization_time DESC
-        LIMIT 1
-    """, (model_name,))
-    result = cursor.fetchone()
-    run_id = result['run_id'] if result else None
+
+    now = time.monotonic()
+    hit = _RUN_IDS.get(model_name)
+    if hit and hit[1] > now:
+        run_id = hit[0]
+    else:
+        run_id   = None
+        model_id = get_model_id(cursor, model_name)
+        if model_id is not None:
+            with cursor.connection.cursor() as cur:
+                cur.execute("""
+                    SELECT run_id
+                    FROM forecast_runs
+                    WHERE model_id = %s
+                    ORDER BY initialization_time DESC
+                    LIMIT 1
+                """, (model_id,))
+                result = cur.fetchone()
+            run_id = result[0] if result else None
+        # Misses aren't cached so a freshly loaded model shows up immediately.
+        if run_id is not None:
+            _RUN_IDS[model_name] = (run_id, now + RUN_ID_TTL)
     cache[model_name] = run_id
     return run_id
 
@@ -739,7 +959,94 @@ SPATIAL_METRIC_REGISTRY = {
 }
 
 
+# Grid endpoints read through a server-side (named) cursor so Postgres streams
+# rows in GRID_FETCH_SIZE batches straight into a NumPy record array, rather
+# than psycopg2 buffering the whole result as Python rows first. Nullable
+# values are COALESCEd to 0 in SQL so every row fits the fixed float dtype.
+GRID_FETCH_SIZE = 10000
+_POINT_DTYPE     = np.dtype([('lat', 'f8'), ('lon', 'f8'), ('value', 'f8')])
+_WIND_DTYPE      = np.dtype([('lat', 'f8'), ('lon', 'f8'), ('u', 'f8'), ('v', 'f8'),
+                             ('speed', 'f8'), ('direction', 'f8')])
+_COMPONENT_DTYPE = np.dtype([('lat', 'f8'), ('lon', 'f8'),
+                             ('variable_id', 'i4'), ('value', 'f8')])
+
+
+def _pair_wind_components(grid, u_id, v_id):
+    """
+    Inner-join the u and v rows of a component grid on (lat, lon) and derive
+    speed/direction, giving the same _WIND_DTYPE rows wind_grid stores. Points
+    missing either component are dropped, as the old SQL self-join did.
+    """
+    u = grid[grid['variable_id'] == u_id]
+    v = grid[grid['variable_id'] == v_id]
+    # complex(lat, lon) sorts/compares lexicographically, so it works as a
+    # single vectorised join key.
+    _, iu, iv = np.intersect1d(u['lat'] + 1j * u['lon'],
+                               v['lat'] + 1j * v['lon'],
+                               return_indices=True)
+    wind = np.empty(len(iu), dtype=_WIND_DTYPE)
+    wind['lat'], wind['lon'] = u['lat'][iu], u['lon'][iu]
+    wind['u'],   wind['v']   = u['value'][iu], v['value'][iv]
+    # Whole-grid array maths instead of a per-point math.sqrt/atan2 loop.
+    wind['speed']     = np.hypot(wind['u'], wind['v'])
+    wind['direction'] = (np.degrees(np.arctan2(wind['u'], wind['v'])) + 180.0) % 360.0
+    return wind
+
+
+# Grid queries resolve the model's latest run inside the same statement, so the
+# run lookup and the data read share one round trip and can't disagree with a
+# freshly loaded run. Referenced as `run_id = (SELECT run_id FROM latest_run)`,
+# an InitPlan, which still lets Postgres prune forecast_data partitions at
+# execution time. Its only parameter is model_id.
+_LATEST_RUN_CTE = """
+    WITH latest_run AS (
+        SELECT run_id
+        FROM forecast_runs
+        WHERE model_id = %s
+        ORDER BY initialization_time DESC
+        LIMIT 1
+    )
+"""
+
+
+def _records(keys, *columns):
+    """Zip equal-length column arrays into the list of point dicts the map layers expect."""
+    return [dict(zip(keys, row)) for row in zip(*(np.asarray(c).tolist() for c in columns))]
+
+
+# ── Binary grid responses ─────────────────────────────────────────────────────
+# ?format=arrow returns a grid as an Arrow IPC stream of float32 columns: about
+# a quarter of the JSON size, and the apache-arrow JS package decodes it
+# straight into typed arrays. Optional — without pyarrow, format=arrow is a 406.
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+GRID_FORMATS   = ('json', 'arrow')
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
+
+def _bad_grid_format(fmt):
+    if fmt not in GRID_FORMATS:
+        return jsonify({'error': f'format must be one of {list(GRID_FORMATS)}'}), 400
+    if fmt == 'arrow' and pa is None:
+        return jsonify({'error': 'Arrow output is not available on this server'}), 406
+    return None
+
+
+def _arrow_response(**columns):
+    table = pa.table({name: np.asarray(col, dtype=np.float32)
+                      for name, col in columns.items()})
+    sink  = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(sink.getvalue().to_pybytes(), mimetype=ARROW_MIMETYPE)
+
+
 @app.route('/api/forecast-data', methods=['GET'])
+@prefetch_neighbour_hours
+@cache_response
 def get_forecast_data():
     model_name    = request.args.get('model', 'AIFS')
     variable_name = request.args.get('variable', 'precipitation')
@@ -750,71 +1057,103 @@ def get_forecast_data():
     except (TypeError, ValueError):
         return jsonify({'error': 'hour must be numeric'}), 400
     member        = request.args.get('member', 'mean')
+    fmt           = request.args.get('format', 'json')
+    format_error  = _bad_grid_format(fmt)
+    if format_error:
+        return format_error
 
     if variable_name == 'wind':
-        return get_wind_data()
-
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+        return _wind_data()
+
+    conn = get_db()
+    with conn.cursor() as cursor:
+        try:
+            model_id = get_model_id(cursor, model_name)
+            if model_id is None:
+                return jsonify({'error': f'No data found for model {model_name}'}), 404
+            variable_id = get_variable_id(cursor, variable_name)
+            if variable_id is None:
+                return jsonify({'error': f'Variable {variable_name} not found'}), 404
+
+            # Each branch picks the value column and its FROM/WHERE; the SELECT
+            # list depends on the output format below.
+            if member == 'mean':
+                value  = 'COALESCE(mean_value, 0)'
+                source = """
+                    FROM ensemble_statistics es
+                    WHERE es.run_id = (SELECT run_id FROM latest_run)
+                      AND es.variable_id = %s
+                      AND es.forecast_hour = %s
+                """
+                params = (model_id, variable_id, forecast_hour)
+
+            elif member == 'std':
+                value  = 'std_dev'
+                source = """
+                    FROM ensemble_statistics es
+                    WHERE es.run_id = (SELECT run_id FROM latest_run)
+                      AND es.variable_id = %s
+                      AND es.forecast_hour = %s
+                      AND std_dev IS NOT NULL
+                """
+                params = (model_id, variable_id, forecast_hour)
 
-    try:
-        run_id = get_model_run_id(cursor, model_name)
-        if not run_id:
-            return jsonify({'error': f'No data found for model {model_name}'}), 404
-
-        if member == 'mean':
-            cursor.execute("""
-                SELECT latitude as lat, longitude as lon, mean_value as value
-                FROM ensemble_statistics es
-                WHERE es.run_id = %s
-                  AND es.variable_id = (SELECT variable_id FROM variables WHERE variable_name = %s)
-                  AND es.forecast_hour = %s
-            """, (run_id, variable_name, forecast_hour))
-
-        elif member == 'std':
-            cursor.execute("""
-                SELECT latitude as lat, longitude as lon, std_dev as value
-                FROM ensemble_statistics es
-                WHERE es.run_id = %s
-                  AND es.variable_id = (SELECT variable_id FROM variables WHERE variable_name = %s)
-                  AND es.forecast_hour = %s
-                  AND std_dev IS NOT NULL
-            """, (run_id, variable_name, forecast_hour))
-
-        else:
-            member_num = int(member)
-            cursor.execute("""
-                SELECT latitude as lat, longitude as lon, value
-                FROM forecast_data
-                WHERE run_id = %s
-                  AND variable_id = (SELECT variable_id FROM variables WHERE variable_name = %s)
-                  AND forecast_hour = %s
-                  AND ensemble_member = %s
-            """, (run_id, variable_name, forecast_hour, member_num))
-
-        data   = cursor.fetchall()
-        result = [
-            {
-                'lat':   float(row['lat']),
-                'lon':   float(row['lon']),
-                'value': float(row['value']) if row['value'] else 0
-            }
-            for row in data
-        ]
-
-        print(f"✅ Returned {len(result)} precipitation points for {model_name} +{forecast_hour}h")
-        return jsonify(result)
-
-    except Exception as e:
-        print(f"❌ Error in forecast-data: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
-    finally:
-        cursor.close()
-        return_db_connection(conn)
+            else:
+                member_num = int(member)
+                value  = 'value'
+                source = """
+                    FROM forecast_data
+                    WHERE run_id = (SELECT run_id FROM latest_run)
+                      AND variable_id = %s
+                      AND forecast_hour = %s
+                      AND ensemble_member = %s
+                """
+                params = (model_id, variable_id, forecast_hour, member_num)
+
+            if fmt == 'arrow':
+                # The server-side cursor is only opened here: closing one that
+                # was never executed costs psycopg2 an extra round trip.
+                with conn.cursor(name='forecast_stream') as stream:
+                    stream.itersize = GRID_FETCH_SIZE
+                    stream.execute(_LATEST_RUN_CTE +
+                                   f"SELECT latitude, longitude, {value}" + source, params)
+                    grid = np.fromiter(stream, dtype=_POINT_DTYPE)
+                found = len(grid) > 0
+            else:
+                # Postgres builds the JSON array itself and it is sent on as-is:
+                # no per-point dicts in Python and no re-serialisation.
+                cursor.execute(_LATEST_RUN_CTE + f"""
+                    SELECT COALESCE(json_agg(json_build_object(
+                        'lat', latitude, 'lon', longitude, 'value', {value})), '[]')::text
+                """ + source, params)
+                payload = cursor.fetchone()[0]
+                found   = payload != '[]'
+
+            if not found and not get_model_run_id(cursor, model_name):
+                return jsonify({'error': f'No data found for model {model_name}'}), 404
+            g.skip_cache = not found
+            if fmt == 'arrow':
+                return _arrow_response(lat=grid['lat'], lon=grid['lon'], value=grid['value'])
+
+            app.logger.info("✅ Returned %d bytes of %s points for %s +%sh",
+                            len(payload), variable_name, model_name, forecast_hour)
+            return Response(payload, mimetype='application/json')
+
+        except Exception as e:
+            app.logger.error("❌ Error in forecast-data: %s", e)
+            return jsonify({'error': 'Internal server error'}), 500
 
 
 @app.route('/api/wind-data', methods=['GET'])
+@prefetch_neighbour_hours
+@cache_response
 def get_wind_data():
+    return _wind_data()
+
+
+def _wind_data():
+    # Shared by /api/wind-data and /api/forecast-data?variable=wind; kept
+    # undecorated so the forecast-data path isn't cached twice.
     model_name    = request.args.get('model', 'AIFS')
     if _bad_token(model_name):
         return jsonify({'error': 'Invalid model'}), 400
@@ -823,96 +1162,86 @@ def get_wind_data():
     except (TypeError, ValueError):
         return jsonify({'error': 'hour must be numeric'}), 400
     member        = request.args.get('member', 'mean')
+    fmt           = request.args.get('format', 'json')
+    format_error  = _bad_grid_format(fmt)
+    if format_error:
+        return format_error
+
+    conn = get_db()
+    with conn.cursor() as cursor:
+        try:
+            model_id = get_model_id(cursor, model_name)
+            if model_id is None:
+                return jsonify({'error': f'No data found for model {model_name}'}), 404
+            u_id = get_variable_id(cursor, 'wind_u_10m')
+            v_id = get_variable_id(cursor, 'wind_v_10m')
+
+            # mean/std read the wind_grid materialized view, where the pairing
+            # and speed/direction were done at load time (materialized_views.sql).
+            # Members aren't in the view: both components come back from one
+            # forecast_data scan as (lat, lon, var, value) rows and are paired
+            # and derived client-side.
+            if member == 'mean':
+                query, params, dtype = _LATEST_RUN_CTE + """
+                    SELECT latitude, longitude, COALESCE(u_mean, 0), COALESCE(v_mean, 0),
+                           mean_speed, mean_direction
+                    FROM wind_grid
+                    WHERE run_id = (SELECT run_id FROM latest_run)
+                      AND forecast_hour = %s
+                """, (model_id, forecast_hour), _WIND_DTYPE
+
+            elif member == 'std':
+                query, params, dtype = _LATEST_RUN_CTE + """
+                    SELECT latitude, longitude, u_std, COALESCE(v_std, 0),
+                           std_speed, std_direction
+                    FROM wind_grid
+                    WHERE run_id = (SELECT run_id FROM latest_run)
+                      AND forecast_hour = %s
+                      AND u_std IS NOT NULL
+                """, (model_id, forecast_hour), _WIND_DTYPE
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-    try:
-        run_id = get_model_run_id(cursor, model_name)
-        if not run_id:
-            return jsonify({'error': f'No data found for model {model_name}'}), 404
-
-        if member == 'mean':
-            cursor.execute("""
-                SELECT 
-                    u.latitude as lat, u.longitude as lon,
-                    u.mean_value as u, v.mean_value as v
-                FROM ensemble_statistics u
-                JOIN ensemble_statistics v 
-                    ON u.run_id = v.run_id 
-                    AND u.forecast_hour = v.forecast_hour 
-                    AND u.latitude = v.latitude 
-                    AND u.longitude = v.longitude
-                WHERE u.run_id = %s
-                  AND u.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_u_10m')
-                  AND v.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_v_10m')
-                  AND u.forecast_hour = %s
-            """, (run_id, forecast_hour))
-
-        elif member == 'std':
-            cursor.execute("""
-                SELECT 
-                    u.latitude as lat, u.longitude as lon,
-                    u.std_dev as u, v.std_dev as v
-                FROM ensemble_statistics u
-                JOIN ensemble_statistics v 
-                    ON u.run_id = v.run_id 
-                    AND u.forecast_hour = v.forecast_hour 
-                    AND u.latitude = v.latitude 
-                    AND u.longitude = v.longitude
-                WHERE u.run_id = %s
-                  AND u.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_u_10m')
-                  AND v.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_v_10m')
-                  AND u.forecast_hour = %s
-                  AND u.std_dev IS NOT NULL
-            """, (run_id, forecast_hour))
-
-        else:
-            member_num = int(member)
-            cursor.execute("""
-                SELECT 
-                    u.latitude as lat, u.longitude as lon,
-                    u.value as u, v.value as v
-                FROM forecast_data u
-                JOIN forecast_data v 
-                    ON u.run_id = v.run_id 
-                    AND u.forecast_hour = v.forecast_hour 
-                    AND u.ensemble_member = v.ensemble_member 
-                    AND u.latitude = v.latitude 
-                    AND u.longitude = v.longitude
-                WHERE u.run_id = %s
-                  AND u.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_u_10m')
-                  AND v.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_v_10m')
-                  AND u.forecast_hour = %s
-                  AND u.ensemble_member = %s
-            """, (run_id, forecast_hour, member_num))
+            else:
+                member_num = int(member)
+                query, params, dtype = _LATEST_RUN_CTE + """
+                    SELECT latitude, longitude, variable_id, value
+                    FROM forecast_data
+                    WHERE run_id = (SELECT run_id FROM latest_run)
+                      AND variable_id IN (%s, %s)
+                      AND forecast_hour = %s
+                      AND ensemble_member = %s
+                """, (model_id, u_id, v_id, forecast_hour, member_num), _COMPONENT_DTYPE
+
+            # Opened only once there is a query to run: closing a never-executed
+            # server-side cursor costs psycopg2 an extra round trip.
+            with conn.cursor(name='wind_stream') as stream:
+                stream.itersize = GRID_FETCH_SIZE
+                stream.execute(query, params)
+                grid = np.fromiter(stream, dtype=dtype)
+            if dtype is _COMPONENT_DTYPE:
+                grid = _pair_wind_components(grid, u_id, v_id)
+
+            if not len(grid) and not get_model_run_id(cursor, model_name):
+                return jsonify({'error': f'No data found for model {model_name}'}), 404
+            g.skip_cache = not len(grid)
+
+            lat, lon, u, v = grid['lat'], grid['lon'], grid['u'], grid['v']
+            speed, direction = grid['speed'], grid['direction']
+            if fmt == 'arrow':
+                return _arrow_response(lat=lat, lon=lon, u=u, v=v,
+                                       speed=speed, direction=direction)
+            result = _records(
+                ('lat', 'lon', 'u', 'v', 'speed', 'direction'),
+                lat, lon, np.round(u, 3), np.round(v, 3),
+                np.round(speed, 2), np.round(direction, 1),
+            )
 
-        data   = cursor.fetchall()
-        result = []
-        for row in data:
-            u = float(row['u']) if row['u'] else 0
-            v = float(row['v']) if row['v'] else 0
-            speed         = math.sqrt(u * u + v * v)
-            direction_rad = math.atan2(u, v)
-            direction_deg = (direction_rad * 180 / math.pi + 180) % 360
-            result.append({
-                'lat':       float(row['lat']),
-                'lon':       float(row['lon']),
-                'u':         round(u, 3),
-                'v':         round(v, 3),
-                'speed':     round(speed, 2),
-                'direction': round(direction_deg, 1)
-            })
+            app.logger.info("✅ Returned %d wind points for %s +%sh (%s)",
+                            len(result), model_name, forecast_hour, member)
+            return jsonify(result)
 
-        print(f"✅ Returned {len(result)} wind points for {model_name} +{forecast_hour}h ({member})")
-        return jsonify(result)
-
-    except Exception as e:
-        print(f"❌ Error in wind-data: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
-    finally:
-        cursor.close()
-        return_db_connection(conn)
+        except Exception as e:
+            app.logger.error("❌ Error in wind-data: %s", e)
+            return jsonify({'error': 'Internal server error'}), 500
 
 
 # ── NEW: Point time-series for Cone of Uncertainty chart ─────────────────────
@@ -934,8 +1263,7 @@ def point_timeseries():
     except (TypeError, ValueError):
         return jsonify({'error': 'lat and lon are required and must be numeric'}), 400
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
 
     try:
         run_id = get_model_run_id(cursor, model_name)
@@ -943,6 +1271,8 @@ def point_timeseries():
             return jsonify({'error': f'No data found for model {model_name}'}), 404
 
         if variable == 'wind':
+            u_id = get_variable_id(cursor, 'wind_u_10m')
+            v_id = get_variable_id(cursor, 'wind_v_10m')
             # Wind speed = sqrt(u² + v²) computed per member then aggregated
             cursor.execute("""
                 SELECT
@@ -971,13 +1301,13 @@ def point_timeseries():
                     AND u.latitude = v.latitude
                     AND u.longitude = v.longitude
                 WHERE u.run_id = %s
-                  AND u.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_u_10m')
-                  AND v.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_v_10m')
+                  AND u.variable_id = %s
+                  AND v.variable_id = %s
                   AND ABS(u.latitude  - %s) <= %s
                   AND ABS(u.longitude - %s) <= %s
                 GROUP BY u.forecast_hour
                 ORDER BY u.forecast_hour
-            """, (run_id, lat, radius, lon, radius))
+            """, (run_id, u_id, v_id, lat, radius, lon, radius))
 
         else:
             # Precipitation — aggregate directly over ensemble members
@@ -994,12 +1324,12 @@ def point_timeseries():
                     PERCENTILE_CONT(0.90) WITHIN GROUP (ORDER BY fd.value)     AS p90
                 FROM forecast_data fd
                 WHERE fd.run_id = %s
-                  AND fd.variable_id = (SELECT variable_id FROM variables WHERE variable_name = %s)
+                  AND fd.variable_id = %s
                   AND ABS(fd.latitude  - %s) <= %s
                   AND ABS(fd.longitude - %s) <= %s
                 GROUP BY fd.forecast_hour
                 ORDER BY fd.forecast_hour
-            """, (run_id, variable, lat, radius, lon, radius))
+            """, (run_id, get_variable_id(cursor, variable), lat, radius, lon, radius))
 
         # Precipitation is stored as period-accumulated totals; divide by accum_h
         # to convert to mm/h rate. Wind, temperature, and pressure are
@@ -1021,16 +1351,15 @@ def point_timeseries():
                 'p90':  round(float(row['p90']       or 0) / accum_h, 4),
             })
 
-        print(f"✅ Timeseries: {len(result)} hours for {model_name} at ({lat}, {lon}) "
-              f"[accum_h={accum_h}]")
+        app.logger.info("✅ Timeseries: %d hours for %s at (%s, %s) [accum_h=%s]",
+                        len(result), model_name, lat, lon, accum_h)
         return jsonify(result)
 
     except Exception as e:
-        print(f"❌ Error in point-timeseries: {str(e)}")
+        app.logger.error("❌ Error in point-timeseries: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 # ─────────────────────────────────────────────────────────────────────────────
 
 
@@ -1054,8 +1383,7 @@ def get_spread_skill():
     except (TypeError, ValueError):
         return jsonify({'error': 'lat and lon are required and must be numeric'}), 400
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
 
     try:
         run_id = get_model_run_id(cursor, model_name)
@@ -1066,13 +1394,16 @@ def get_spread_skill():
         init_time = cursor.fetchone()['initialization_time']
 
         obs_col = 'wind_speed' if variable == 'wind' else 'precipitation'
+        u_id    = get_variable_id(cursor, 'wind_u_10m')
+        v_id    = get_variable_id(cursor, 'wind_v_10m')
+        var_id  = u_id if variable == 'wind' else get_variable_id(cursor, variable)
 
         # Find forecast hours that have a matching observation within the radius
         cursor.execute("""
             SELECT DISTINCT fd.forecast_hour
             FROM forecast_data fd
             WHERE fd.run_id = %s
-              AND fd.variable_id = (SELECT variable_id FROM variables WHERE variable_name = %s)
+              AND fd.variable_id = %s
               AND ABS(fd.latitude  - %s) <= %s
               AND ABS(fd.longitude - %s) <= %s
               AND EXISTS (
@@ -1083,7 +1414,7 @@ def get_spread_skill():
                     AND o.""" + obs_col + """ IS NOT NULL
               )
             ORDER BY fd.forecast_hour
-        """, (run_id, 'wind_u_10m' if variable == 'wind' else variable,
+        """, (run_id, var_id,
               lat, radius, lon, radius,
               str(init_time), lat, radius, lon, radius))
 
@@ -1104,22 +1435,22 @@ def get_spread_skill():
                        AND u.ensemble_member = v.ensemble_member
                        AND u.latitude = v.latitude AND u.longitude = v.longitude
                     WHERE u.run_id = %s AND u.forecast_hour = %s
-                      AND u.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_u_10m')
-                      AND v.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_v_10m')
+                      AND u.variable_id = %s
+                      AND v.variable_id = %s
                       AND ABS(u.latitude  - %s) <= %s
                       AND ABS(u.longitude - %s) <= %s
                       AND u.ensemble_member IS NOT NULL
-                """, (run_id, hour, lat, radius, lon, radius))
+                """, (run_id, hour, u_id, v_id, lat, radius, lon, radius))
             else:
                 cursor.execute("""
                     SELECT value AS member_val FROM forecast_data
                     WHERE run_id = %s AND forecast_hour = %s
-                      AND variable_id = (SELECT variable_id FROM variables WHERE variable_name = %s)
+                      AND variable_id = %s
                       AND ABS(latitude  - %s) <= %s
                       AND ABS(longitude - %s) <= %s
                       AND ensemble_member IS NOT NULL
                     ORDER BY ensemble_member
-                """, (run_id, hour, variable, lat, radius, lon, radius))
+                """, (run_id, hour, var_id, lat, radius, lon, radius))
 
             # Precipitation members are period-accumulated totals (mm/6h for AIFS,
             # mm/3h for GEFS, mm/h for UKMO). IMERG observations are in mm/h.
@@ -1178,15 +1509,15 @@ def get_spread_skill():
             )
             correlation = round(num / den, 4) if den > 1e-10 else None
 
-        print(f"✅ Spread-skill: {len(results)} hours matched, corr={correlation} for ({lat},{lon})")
+        app.logger.info("✅ Spread-skill: %d hours matched, corr=%s for (%s,%s)",
+                        len(results), correlation, lat, lon)
         return jsonify({'hours': results, 'correlation': correlation, 'n_cases': len(results)})
 
     except Exception as e:
-        print(f"❌ Error in spread-skill: {str(e)}")
+        app.logger.error("❌ Error in spread-skill: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 @app.route('/api/spatial-metric', methods=['GET'])
@@ -1214,8 +1545,7 @@ def get_spatial_metric():
     obs_col    = 'wind_speed' if variable == 'wind' else 'precipitation'
     var_lookup = 'wind_u_10m' if variable == 'wind' else variable
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         run_id = get_model_run_id(cursor, model_name)
         if not run_id:
@@ -1226,29 +1556,24 @@ def get_spatial_metric():
         )
         init_time = cursor.fetchone()['initialization_time']
 
-        cursor.execute(
-            "SELECT variable_id FROM variables WHERE variable_name = %s", (var_lookup,)
-        )
-        var_row = cursor.fetchone()
-        if not var_row:
+        variable_id = get_variable_id(cursor, var_lookup)
+        if variable_id is None:
             return jsonify({'error': f'Variable {var_lookup} not found'}), 404
-        variable_id = var_row['variable_id']
 
         dispatch = SPATIAL_METRIC_REGISTRY[metric]
         points, extra = dispatch(
             cursor, run_id, variable_id, init_time, request.args,
             min_lat, max_lat, min_lon, max_lon, obs_col,
         )
-        print(f"✅ Spatial {metric}: {len(points)} pts — {model_name} "
-              f"bbox [{min_lat},{max_lat}]×[{min_lon},{max_lon}]")
+        app.logger.info("✅ Spatial %s: %d pts — %s bbox [%s,%s]×[%s,%s]",
+                        metric, len(points), model_name, min_lat, max_lat, min_lon, max_lon)
         return jsonify({'metric': metric, 'points': points, **extra})
 
     except Exception as e:
-        print(f"❌ Error in spatial-metric: {e}")
+        app.logger.error("❌ Error in spatial-metric: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 # ── Plot style registry ────────────────────────────────────────────────────────
@@ -1521,19 +1846,17 @@ def spatial_metric_plot():
         img_b64 = base64.b64encode(buf.read()).decode('utf-8')
         plt.close(fig)
 
-        print(f"✅ Plot: {metric} · {model} · {var_label} · {len(points)} pts")
+        app.logger.info("✅ Plot: %s · %s · %s · %d pts", metric, model, var_label, len(points))
         return jsonify({'image': img_b64})
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        app.logger.exception("❌ Error in spatial-metric-plot: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
 
 @app.route('/api/models', methods=['GET'])
 def get_models():
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         cursor.execute("""
             SELECT DISTINCT m.model_name, m.model_id
@@ -1545,26 +1868,22 @@ def get_models():
         return jsonify([{'name': m['model_name'], 'id': m['model_id']} for m in models])
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 @app.route('/api/variables', methods=['GET'])
 def get_variables():
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         cursor.execute("SELECT variable_name FROM variables ORDER BY variable_name")
         variables = cursor.fetchall()
         return jsonify([v['variable_name'] for v in variables])
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    conn   = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db().cursor()
     try:
         cursor.execute("SELECT COUNT(*) FROM forecast_data")
         count = cursor.fetchone()[0]
@@ -1577,7 +1896,6 @@ def health_check():
         return jsonify({"status": "unhealthy", "error": str(e)}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 # ── Model accumulation periods (hours) ───────────────────────────────────────
@@ -1627,8 +1945,7 @@ def compare_timeseries():
     if not models:
         return jsonify({'error': 'No models specified'}), 400
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         cursor.execute("""
             SELECT model_name, forecast_hour, mean_value, std_dev
@@ -1657,16 +1974,15 @@ def compare_timeseries():
                 'std':  round(float(row['std_dev']),    4) if row['std_dev']    is not None else None,
             })
 
-        print(f"✅ compare/timeseries: {sum(len(v) for v in result.values())} pts "
-              f"for models {models} at ({lat},{lon})")
+        app.logger.info("✅ compare/timeseries: %d pts for models %s at (%s,%s)",
+                        sum(len(v) for v in result.values()), models, lat, lon)
         return jsonify(result)
 
     except Exception as e:
-        print(f"❌ Error in compare/timeseries: {e}")
+        app.logger.error("❌ Error in compare/timeseries: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 @app.route('/api/compare/skill', methods=['POST'])
@@ -1706,8 +2022,7 @@ def compare_skill():
     if not models:
         return jsonify({'error': 'No models specified'}), 400
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         # ------------------------------------------------------------------
         # 1. Fetch forecast rows for all requested models
@@ -1927,9 +2242,8 @@ def compare_skill():
         else:
             obs_warning = 'No observations found for this location/variable.'
 
-        print(f"✅ compare/skill: {len(result_models)} models, "
-              f"{len(obs_hours_sorted)} obs hours at ({lat},{lon}), "
-              f"accum_hours={MODEL_ACCUM_HOURS}")
+        app.logger.info("✅ compare/skill: %d models, %d obs hours at (%s,%s), accum_hours=%s",
+                        len(result_models), len(obs_hours_sorted), lat, lon, MODEL_ACCUM_HOURS)
         return jsonify({
             'models':             result_models,
             'obs_hours':          obs_hours_sorted,
@@ -1940,13 +2254,10 @@ def compare_skill():
         })
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"❌ Error in compare/skill: {e}")
+        app.logger.exception("❌ Error in compare/skill: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 @app.route('/api/compare/spatial-agreement', methods=['POST'])
@@ -1989,8 +2300,7 @@ def compare_spatial_agreement():
     if not models or len(models) < 2:
         return jsonify({'error': 'At least 2 models required for spatial agreement'}), 400
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         cursor.execute("""
             SELECT
@@ -2134,8 +2444,8 @@ def compare_spatial_agreement():
         img_b64 = base64.b64encode(buf.read()).decode('utf-8')
         plt.close(fig)
 
-        print(f"✅ compare/spatial-agreement: {n_points} pts, "
-              f"{n_models} models, +{hour}h, {variable}")
+        app.logger.info("✅ compare/spatial-agreement: %d pts, %d models, +%sh, %s",
+                        n_points, n_models, hour, variable)
         return jsonify({
             'image':    img_b64,
             'hour':     hour,
@@ -2144,13 +2454,10 @@ def compare_spatial_agreement():
         })
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"❌ Error in compare/spatial-agreement: {e}")
+        app.logger.exception("❌ Error in compare/spatial-agreement: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 @app.route('/api/categorical-metrics', methods=['POST'])
@@ -2199,8 +2506,7 @@ def categorical_metrics_endpoint():
     except (TypeError, ValueError):
         return jsonify({'error': 'threshold must be numeric'}), 400
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         # ── 1. Forecast rows ─────────────────────────────────────────────────
         cursor.execute("""
@@ -2346,11 +2652,13 @@ def categorical_metrics_endpoint():
             "Ingest more data to extend verification coverage."
         ) if obs_hours_list else 'No observations found.'
 
-        thr_display = f"{threshold_rate} m/s" if is_wind else f"{round(threshold_rate * 6, 2)} mm/6h"
-        print(f"✅ categorical-metrics: {model_name} {variable} ({lat},{lon}) "
-              f"thr={thr_display}  "
-              f"H={hits} M={misses} FA={false_alarms} CN={correct_neg}  "
-              f"CSI={csi} POD={pod} FAR={far} FBI={fbi} BS={bs} CC={composite}")
+        app.logger.info("✅ categorical-metrics: %s %s (%s,%s) thr=%s %s  "
+                        "H=%s M=%s FA=%s CN=%s  CSI=%s POD=%s FAR=%s FBI=%s BS=%s CC=%s",
+                        model_name, variable, lat, lon,
+                        *((threshold_rate, 'm/s') if is_wind
+                          else (round(threshold_rate * 6, 2), 'mm/6h')),
+                        hits, misses, false_alarms, correct_neg,
+                        csi, pod, far, fbi, bs, composite)
 
         threshold_info = {'threshold_rate': round(threshold_rate, 4), 'accum_h': accum_h, 'model': model_name}
         if is_wind:
@@ -2380,12 +2688,10 @@ def categorical_metrics_endpoint():
         })
 
     except Exception as e:
-        import traceback; traceback.print_exc()
-        print(f"❌ Error in categorical-metrics: {e}")
+        app.logger.exception("❌ Error in categorical-metrics: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 @app.route('/api/region-categorical-metrics', methods=['POST'])
@@ -2428,8 +2734,7 @@ def region_categorical_metrics_endpoint():
     except (TypeError, ValueError):
         return jsonify({'error': 'threshold must be numeric'}), 400
 
-    conn   = get_db_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cursor = get_db().cursor(cursor_factory=RealDictCursor)
     try:
         # ── 1. Fetch all forecast grid points in bbox ─────────────────────────
         cursor.execute("""
@@ -2618,11 +2923,12 @@ def region_categorical_metrics_endpoint():
             f"({obs_hours_list[0]}h–{obs_hours_list[-1]}h) across ~{n_grid_pts} grid points."
         ) if obs_hours_list else 'No observations matched.'
 
-        print(f"✅ region-categorical-metrics: {model_name} {variable} "
-              f"bbox=[{min_lat},{max_lat},{min_lon},{max_lon}] "
-              f"thr={threshold_rate} ({body.get('threshold_ms') or body.get('threshold_mm_6h')} raw)  "
-              f"H={total_hits} M={total_misses} FA={total_fa} CN={total_cn}  "
-              f"CSI={csi} POD={pod} FAR={far} FSS={mean_fss} CC={composite}")
+        app.logger.info("✅ region-categorical-metrics: %s %s bbox=[%s,%s,%s,%s] thr=%s (%s raw)  "
+                        "H=%s M=%s FA=%s CN=%s  CSI=%s POD=%s FAR=%s FSS=%s CC=%s",
+                        model_name, variable, min_lat, max_lat, min_lon, max_lon,
+                        threshold_rate, body.get('threshold_ms') or body.get('threshold_mm_6h'),
+                        total_hits, total_misses, total_fa, total_cn,
+                        csi, pod, far, mean_fss, composite)
 
         return jsonify({
             'hours':   hours_data,
@@ -2648,12 +2954,10 @@ def region_categorical_metrics_endpoint():
         })
 
     except Exception as e:
-        import traceback; traceback.print_exc()
-        print(f"❌ Error in region-categorical-metrics: {e}")
+        app.logger.exception("❌ Error in region-categorical-metrics: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
     finally:
         cursor.close()
-        return_db_connection(conn)
 
 
 if __name__ == '__main__':
@@ -2662,8 +2966,8 @@ if __name__ == '__main__':
     print("📍 http://localhost:5000")
     print("=" * 60)
     print("Available endpoints:")
-    print("  • GET  /api/forecast-data?model=AIFS&variable=precipitation&hour=6&member=mean")
-    print("  • GET  /api/wind-data?model=GEFS&hour=12&member=0")
+    print("  • GET  /api/forecast-data?model=AIFS&variable=precipitation&hour=6&member=mean[&format=arrow]")
+    print("  • GET  /api/wind-data?model=GEFS&hour=12&member=0[&format=arrow]")
     print("  • GET  /api/point-timeseries?model=AIFS&variable=precipitation&lat=35.0&lon=-75.0")
     print("  • GET  /api/spread-skill?model=AIFS&variable=precipitation&lat=35.0&lon=-75.0")
     print("  • POST /api/spatial-metric-plot  {metric, model, variable, hour, n_hours, points}")
@@ -2686,4 +2990,5 @@ if __name__ == '__main__':
     # Default OFF: the Werkzeug debugger allows remote code execution and must never
     # be on for a deployed/beta instance. Local dev opts in via FLASK_DEBUG=true in .env.
     flask_debug = os.environ.get('FLASK_DEBUG', 'false').lower() in ('1', 'true', 'yes')
+    warmup()
     app.run(debug=flask_debug, host='0.0.0.0', port=flask_port)
\ No newline at end of file
@@ -1,16 +1,68 @@
+import csv
+import io
 import json
+import multiprocessing.util
+import os
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_values
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
 import re
 
+from api_cache import invalidate_api_cache
+
+# orjson parses several times faster than the stdlib; ijson streams files too
+# big to hold in memory. Both are optional.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+STREAM_THRESHOLD_BYTES = 200 * 1024 * 1024
+CHUNK_ROWS = 10000
+
+# Files load in parallel worker processes, each with its own connection —
+# Postgres absorbs concurrent COPY streams far faster than one session can
+# parse and send them. A worker loads FILES_PER_BATCH files per transaction.
+LOAD_WORKERS = int(os.environ.get('LOAD_WORKERS', os.cpu_count() or 1))
+FILES_PER_BATCH = 25
+
+
+def read_points(json_path):
+    """Yield the point dicts of a JSON array file, streaming it if it's large"""
+    with open(json_path, 'rb') as f:
+        if ijson is not None and os.path.getsize(json_path) > STREAM_THRESHOLD_BYTES:
+            yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from json_loads(f.read())
+
+
+def chunked(rows, size=CHUNK_ROWS):
+    """Split an iterable into lists of at most `size` items"""
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
 
 class WeatherDataLoader:
     """Load weather forecast JSON data into PostgreSQL"""
 
     def __init__(self, db_config):
+        self.db_config = db_config
         self.conn = psycopg2.connect(**db_config)
         self.cursor = self.conn.cursor()
+        # Bulk-load session settings: don't wait for the WAL flush on commit
+        # (a crash can only lose the last moments of a re-runnable load) and
+        # give the std UPDATE ... FROM join room to hash in memory.
+        self.cursor.execute("SET synchronous_commit = off")
+        self.cursor.execute("SET work_mem = '256MB'")
+        self.conn.commit()
+        self.run_ids = {}
         print("✅ Connected to PostgreSQL database")
 
     def get_model_id(self, model_name):
@@ -30,6 +82,8 @@ class WeatherDataLoader:
         return result[0] if result else None
 
     def create_forecast_run(self, model_name, init_time):
+        if (model_name, init_time) in self.run_ids:
+            return self.run_ids[(model_name, init_time)]
         model_id = self.get_model_id(model_name)
 
         self.cursor.execute("""
@@ -40,8 +94,18 @@ class WeatherDataLoader:
             RETURNING run_id
         """, (model_id, init_time))
 
-        self.conn.commit()
-        return self.cursor.fetchone()[0]
+        run_id = self.cursor.fetchone()[0]
+        # forecast_data is partitioned per run; create this run's partitions.
+        self.cursor.execute("SELECT ensure_forecast_data_partition(%s)", (run_id,))
+        self.run_ids[(model_name, init_time)] = run_id
+        return run_id
+
+    def copy_rows(self, target, rows):
+        """COPY row tuples into `target` ("table (col, ...)") via an in-memory CSV buffer"""
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)   # None → empty field → NULL in CSV COPY
+        buf.seek(0)
+        self.cursor.copy_expert(f"COPY {target} FROM STDIN WITH (FORMAT csv)", buf)
 
     def extract_metadata_from_filename(self, filename):
         hour_match = re.search(r'-(\d+)h-', filename)
@@ -70,54 +134,89 @@ class WeatherDataLoader:
         run_id = self.create_forecast_run(model_name, init_time)
         variable_id = self.get_variable_id(variable_name)
 
-        with open(json_path, 'r') as f:
-            data = json.load(f)
-
-        if len(data) == 0:
-            return 0
+        # Rows are generated lazily and written in CHUNK_ROWS batches, so a
+        # file never exists in memory as both parsed JSON and insert tuples.
+        points = read_points(json_path)
+        n_points = 0
 
         if file_type in ['member', 'deterministic']:
-            insert_data = [
+            insert_data = (
                 (run_id, variable_id, forecast_hour, member_num,
                  point['lat'], point['lon'], point['value'])
-                for point in data
-            ]
-
-            execute_batch(self.cursor, """
-                INSERT INTO forecast_data 
-                (run_id, variable_id, forecast_hour, ensemble_member, latitude, longitude, value)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, insert_data, page_size=1000)
+                for point in points
+            )
+
+            # Member files are the bulk of a load — COPY rather than INSERT.
+            for chunk in chunked(insert_data):
+                self.copy_rows(
+                    "forecast_data (run_id, variable_id, forecast_hour, ensemble_member,"
+                    " latitude, longitude, value)",
+                    chunk
+                )
+                n_points += len(chunk)
 
         elif file_type == 'mean':
-            insert_data = [
+            insert_data = (
                 (run_id, variable_id, forecast_hour,
                  point['lat'], point['lon'], point['value'])
-                for point in data
-            ]
+                for point in points
+            )
 
-            execute_batch(self.cursor, """
-                INSERT INTO ensemble_statistics 
-                (run_id, variable_id, forecast_hour, latitude, longitude, mean_value)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, insert_data, page_size=1000)
+            for chunk in chunked(insert_data):
+                execute_values(self.cursor, """
+                    INSERT INTO ensemble_statistics
+                    (run_id, variable_id, forecast_hour, latitude, longitude, mean_value)
+                    VALUES %s
+                """, chunk, page_size=5000)
+                n_points += len(chunk)
 
         elif file_type == 'std':
-            update_data = [
-                (point['value'], run_id, variable_id, forecast_hour,
-                 point['lat'], point['lon'])
-                for point in data
-            ]
-
-            execute_batch(self.cursor, """
-                UPDATE ensemble_statistics
-                SET std_dev = %s
-                WHERE run_id = %s AND variable_id = %s AND forecast_hour = %s
-                  AND latitude = %s AND longitude = %s
-            """, update_data, page_size=1000)
+            update_data = (
+                (point['lat'], point['lon'], point['value'])
+                for point in points
+            )
+
+            # Stage the values with COPY, then apply them in one set-based
+            # UPDATE instead of one UPDATE statement per grid point.
+            self.cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS std_staging
+                (latitude FLOAT, longitude FLOAT, std_dev FLOAT)
+            """)
+            self.cursor.execute("TRUNCATE std_staging")
+            for chunk in chunked(update_data):
+                self.copy_rows("std_staging (latitude, longitude, std_dev)", chunk)
+                n_points += len(chunk)
+            self.cursor.execute("""
+                UPDATE ensemble_statistics es
+                SET std_dev = t.std_dev
+                FROM std_staging t
+                WHERE es.run_id = %s AND es.variable_id = %s AND es.forecast_hour = %s
+                  AND es.latitude = t.latitude AND es.longitude = t.longitude
+            """, (run_id, variable_id, forecast_hour))
+
+        return n_points
+
+    def load_files(self, json_files, model_name, init_time, variable_name='precipitation'):
+        """
+        Load files in one transaction, each under a savepoint so a bad file is
+        rolled back on its own. Returns (files_loaded, total_points).
+        """
+        files_loaded = 0
+        total_points = 0
+
+        for json_file in json_files:
+            self.cursor.execute("SAVEPOINT load_file")
+            try:
+                points = self.load_json_file(json_file, model_name, init_time, variable_name)
+                self.cursor.execute("RELEASE SAVEPOINT load_file")
+                total_points += points
+                files_loaded += 1
+            except Exception as e:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT load_file")
+                print(f"  ❌ {Path(json_file).name}: {str(e)}")
 
         self.conn.commit()
-        return len(data)
+        return files_loaded, total_points
 
     def load_all_files_for_model(self, folder_path, model_name, init_time, variable_name='precipitation'):
         folder = Path(folder_path)
@@ -135,23 +234,62 @@ class WeatherDataLoader:
         print(f"Loading {model_name} {variable_name} - {len(json_files)} files")
         print(f"{'=' * 70}\n")
 
+        # The run row and its partitions are created and committed up front and
+        # the run_id handed to the workers, so they never re-run the upsert
+        # (its row lock would be held for a whole batch, serialising them).
+        # std files UPDATE the rows the mean files insert, so they load in a
+        # second pass once every mean is committed.
+        self.create_forecast_run(model_name, init_time)
+        self.conn.commit()
+        is_std = [self.extract_metadata_from_filename(f.name)[2] == 'std' for f in json_files]
+        passes = (
+            [str(f) for f, std in zip(json_files, is_std) if not std],
+            [str(f) for f, std in zip(json_files, is_std) if std],
+        )
+
         total_points = 0
         files_loaded = 0
 
-        for json_file in json_files:
-            try:
-                points = self.load_json_file(str(json_file), model_name, init_time, variable_name)
-                total_points += points
-                files_loaded += 1
-
-                if files_loaded % 200 == 0:
-                    print(f"  {files_loaded}/{len(json_files)} files, {total_points:,} points...")
-            except Exception as e:
-                print(f"  ❌ {json_file.name}: {str(e)}")
+        with ProcessPoolExecutor(max_workers=LOAD_WORKERS, initializer=_init_worker,
+                                 initargs=(self.db_config, dict(self.run_ids))) as pool:
+            for batch_files in passes:
+                futures = {
+                    pool.submit(_load_file_batch, batch, model_name, init_time, variable_name): batch
+                    for batch in chunked(batch_files, FILES_PER_BATCH)
+                }
+                for future in as_completed(futures):
+                    try:
+                        loaded, points = future.result()
+                    except Exception as e:
+                        # Per-file errors are handled inside the batch; this is
+                        # the batch's connection/commit failing. Other batches
+                        # have committed, so report it and carry on.
+                        batch = futures[future]
+                        print(f"  ❌ batch of {len(batch)} files from {Path(batch[0]).name}: {str(e)}")
+                        continue
+                    if (files_loaded + loaded) // 200 > files_loaded // 200:
+                        print(f"  {files_loaded + loaded}/{len(json_files)} files, "
+                              f"{total_points + points:,} points...")
+                    files_loaded += loaded
+                    total_points += points
 
         print(f"\n✅ {model_name} {variable_name}: {files_loaded} files, {total_points:,} points")
+        if files_loaded:
+            # New data is committed — drop any API responses built from the old run.
+            invalidate_api_cache()
         return total_points
 
+    def refresh_wind_grid(self):
+        """
+        Rebuild the wind_grid materialized view read by /api/wind-data. The view
+        pairs u with v, so call this once, after both components are loaded —
+        a refresh in between drops the new run from the view. It rescans every
+        run's wind rows, so it is the expensive step of a wind load.
+        """
+        self.cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY wind_grid")
+        self.conn.commit()
+        invalidate_api_cache()
+
     def get_database_stats(self):
         print(f"\n{'=' * 70}")
         print("DATABASE STATISTICS")
@@ -168,6 +306,25 @@ class WeatherDataLoader:
         self.conn.close()
 
 
+# ── Process-pool workers ──────────────────────────────────────────────────
+_worker_loader = None
+
+
+def _init_worker(db_config, run_ids):
+    """Pool initializer: connect once per worker process, with the parent's run ids"""
+    global _worker_loader
+    _worker_loader = WeatherDataLoader(db_config)
+    _worker_loader.run_ids.update(run_ids)
+    # Pool workers exit through multiprocessing, which skips atexit handlers
+    # but runs its own finalizers — close the connection cleanly on shutdown.
+    multiprocessing.util.Finalize(_worker_loader, _worker_loader.close, exitpriority=10)
+
+
+def _load_file_batch(json_files, model_name, init_time, variable_name='precipitation'):
+    """Pool task: load a batch of files on this worker's connection"""
+    return _worker_loader.load_files(json_files, model_name, init_time, variable_name)
+
+
 if __name__ == "__main__":
 
     db_config = {
@@ -211,6 +368,9 @@ if __name__ == "__main__":
             variable_name='wind_v_10m'
         )
 
+        # Both components are in — pair them for /api/wind-data in one refresh.
+        loader.refresh_wind_grid()
+
         loader.get_database_stats()
         print("\n✅ GEFS & UKMO WIND DATA LOADED!")
 
@@ -0,0 +1,41 @@
+-- Precomputed read models for the hot API endpoints. Re-runnable; run after
+-- schema.sql / add_indexes.sql. The wind loaders refresh them once both the u
+-- and v components of a load are committed.
+
+-- wind_grid: the u/v ensemble mean and std components paired per grid point,
+-- with speed and direction derived once here (at refresh, i.e. load time)
+-- rather than on every request, so /api/wind-data (member=mean|std) is one
+-- index scan with no pairing or trig work. NULL components count as 0, as the
+-- endpoint always did. DISTINCT ON keeps the unique index below valid even if
+-- a grid point was loaded twice.
+DROP MATERIALIZED VIEW IF EXISTS wind_grid;
+
+CREATE MATERIALIZED VIEW wind_grid AS
+SELECT
+    p.*,
+    SQRT(COALESCE(p.u_mean, 0) ^ 2 + COALESCE(p.v_mean, 0) ^ 2) AS mean_speed,
+    MOD((DEGREES(ATAN2(COALESCE(p.u_mean, 0), COALESCE(p.v_mean, 0))) + 180)::numeric,
+        360)::float AS mean_direction,
+    SQRT(COALESCE(p.u_std, 0) ^ 2 + COALESCE(p.v_std, 0) ^ 2)   AS std_speed,
+    MOD((DEGREES(ATAN2(COALESCE(p.u_std, 0), COALESCE(p.v_std, 0))) + 180)::numeric,
+        360)::float AS std_direction
+FROM (
+    SELECT DISTINCT ON (u.run_id, u.forecast_hour, u.latitude, u.longitude)
+        u.run_id, u.forecast_hour, u.latitude, u.longitude,
+        u.mean_value AS u_mean, v.mean_value AS v_mean,
+        u.std_dev    AS u_std,  v.std_dev    AS v_std
+    FROM ensemble_statistics u
+    JOIN ensemble_statistics v
+        ON  v.run_id = u.run_id
+        AND v.forecast_hour = u.forecast_hour
+        AND v.latitude = u.latitude
+        AND v.longitude = u.longitude
+    WHERE u.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_u_10m')
+      AND v.variable_id = (SELECT variable_id FROM variables WHERE variable_name = 'wind_v_10m')
+    ORDER BY u.run_id, u.forecast_hour, u.latitude, u.longitude
+) p;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY; also the endpoint's
+-- (run_id, forecast_hour) lookup path.
+CREATE UNIQUE INDEX idx_wind_grid_run_hour_latlon
+    ON wind_grid(run_id, forecast_hour, latitude, longitude);
@@ -0,0 +1,69 @@
+-- Convert an existing (unpartitioned) forecast_data table to the partitioned
+-- layout defined in schema.sql. Run once, in a maintenance window — it copies
+-- every row and holds an exclusive lock on forecast_data until it commits:
+--   psql -d weave_weather -f Data/partition_forecast_data.sql
+
+BEGIN;
+
+ALTER TABLE forecast_data RENAME TO forecast_data_old;
+
+CREATE TABLE forecast_data (
+    data_id BIGINT NOT NULL DEFAULT nextval('forecast_data_data_id_seq'),
+    run_id INTEGER NOT NULL REFERENCES forecast_runs(run_id),
+    variable_id INTEGER REFERENCES variables(variable_id),
+    forecast_hour INTEGER NOT NULL,
+    ensemble_member INTEGER,
+    latitude FLOAT NOT NULL,
+    longitude FLOAT NOT NULL,
+    value REAL NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_id, forecast_hour, data_id)
+) PARTITION BY LIST (run_id);
+
+-- Keep the existing id sequence (so ids carry on) but hand it to the new table,
+-- otherwise dropping forecast_data_old would drop it too.
+ALTER SEQUENCE forecast_data_data_id_seq OWNED BY forecast_data.data_id;
+
+-- Same definition as schema.sql.
+CREATE OR REPLACE FUNCTION ensure_forecast_data_partition(p_run_id INTEGER)
+RETURNS void AS $$
+DECLARE
+    run_part TEXT := 'forecast_data_r' || p_run_id;
+    h        INTEGER;
+BEGIN
+    IF to_regclass(run_part) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF forecast_data FOR VALUES IN (%s) '
+        'PARTITION BY RANGE (forecast_hour)', run_part, p_run_id);
+    FOR h IN 0..168 BY 24 LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s)',
+            run_part || '_h' || h, run_part, h, h + 24);
+    END LOOP;
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT',
+                   run_part || '_hdefault', run_part);
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_forecast_data_partition(run_id) FROM forecast_runs;
+
+INSERT INTO forecast_data
+    (data_id, run_id, variable_id, forecast_hour, ensemble_member,
+     latitude, longitude, value, created_at)
+SELECT data_id, run_id, variable_id, forecast_hour, ensemble_member,
+       latitude, longitude, value, created_at
+FROM forecast_data_old;
+
+DROP TABLE forecast_data_old;
+
+-- Indexes on the parent cascade to every current and future partition.
+CREATE INDEX idx_forecast_data_lat_lon ON forecast_data(latitude, longitude);
+CREATE INDEX idx_fd_run_var_hr_mem ON forecast_data(run_id, variable_id, forecast_hour, ensemble_member)
+    INCLUDE (latitude, longitude, value);
+CREATE INDEX idx_forecast_data_run_var_latlon ON forecast_data(run_id, variable_id, latitude, longitude);
+
+COMMIT;
+
+ANALYZE forecast_data;
@@ -0,0 +1,31 @@
+-- Store grid values as REAL (float32) instead of FLOAT (float64), matching
+-- schema.sql. Halves the value columns on disk and in every page the grid
+-- endpoints scan; float32 keeps ~7 significant digits, well beyond what the
+-- models resolve or the API rounds to. Coordinates stay FLOAT. Run once:
+--   psql -d weave_weather -f Data/quantize_values.sql
+-- Rewrites both tables under an exclusive lock — use a maintenance window.
+
+BEGIN;
+
+-- wind_grid reads the ensemble_statistics columns being retyped, so it has to
+-- go first; it is rebuilt from materialized_views.sql below.
+DROP MATERIALIZED VIEW IF EXISTS wind_grid;
+
+-- Propagates to every run/forecast-hour partition.
+ALTER TABLE forecast_data ALTER COLUMN value TYPE REAL;
+
+ALTER TABLE ensemble_statistics
+    ALTER COLUMN mean_value    TYPE REAL,
+    ALTER COLUMN std_dev       TYPE REAL,
+    ALTER COLUMN min_value     TYPE REAL,
+    ALTER COLUMN max_value     TYPE REAL,
+    ALTER COLUMN percentile_25 TYPE REAL,
+    ALTER COLUMN percentile_50 TYPE REAL,
+    ALTER COLUMN percentile_75 TYPE REAL;
+
+COMMIT;
+
+\ir materialized_views.sql
+
+VACUUM ANALYZE forecast_data;
+VACUUM ANALYZE ensemble_statistics;
@@ -29,22 +29,52 @@ CREATE TABLE forecast_runs (
 );
 
 -- 4. Main forecast data table
+-- Partitioned by run (LIST), then by forecast hour (RANGE). Every query filters
+-- on run_id + forecast_hour, so the planner prunes down to one small partition.
+-- Loaders call ensure_forecast_data_partition(run_id) before inserting a run.
+-- Values (here and in ensemble_statistics) are REAL: half the size of FLOAT and
+-- still more precision than the forecasts carry. Coordinates stay FLOAT.
 CREATE TABLE forecast_data (
-    data_id BIGSERIAL PRIMARY KEY,
-    run_id INTEGER REFERENCES forecast_runs(run_id),
+    data_id BIGSERIAL,
+    run_id INTEGER NOT NULL REFERENCES forecast_runs(run_id),
     variable_id INTEGER REFERENCES variables(variable_id),
     forecast_hour INTEGER NOT NULL,
     ensemble_member INTEGER,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
-    value FLOAT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    value REAL NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_id, forecast_hour, data_id)
+) PARTITION BY LIST (run_id);
+
+-- One partition per run, sub-partitioned into 24 h forecast-hour blocks
+-- (0–191 h) plus a DEFAULT block for longer lead times. Idempotent.
+CREATE OR REPLACE FUNCTION ensure_forecast_data_partition(p_run_id INTEGER)
+RETURNS void AS $$
+DECLARE
+    run_part TEXT := 'forecast_data_r' || p_run_id;
+    h        INTEGER;
+BEGIN
+    IF to_regclass(run_part) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF forecast_data FOR VALUES IN (%s) '
+        'PARTITION BY RANGE (forecast_hour)', run_part, p_run_id);
+    FOR h IN 0..168 BY 24 LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%s) TO (%s)',
+            run_part || '_h' || h, run_part, h, h + 24);
+    END LOOP;
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT',
+                   run_part || '_hdefault', run_part);
+END;
+$$ LANGUAGE plpgsql;
 
 -- Create indexes for fast queries
 CREATE INDEX idx_forecast_data_lat_lon ON forecast_data(latitude, longitude);
-CREATE INDEX idx_forecast_data_run_var_hour ON forecast_data(run_id, variable_id, forecast_hour);
-CREATE INDEX idx_forecast_data_run_var_hour_member ON forecast_data(run_id, variable_id, forecast_hour, ensemble_member);
+CREATE INDEX idx_fd_run_var_hr_mem ON forecast_data(run_id, variable_id, forecast_hour, ensemble_member)
+    INCLUDE (latitude, longitude, value);
 
 -- 5. Precomputed ensemble statistics table
 CREATE TABLE ensemble_statistics (
@@ -54,19 +84,20 @@ CREATE TABLE ensemble_statistics (
     forecast_hour INTEGER NOT NULL,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
-    mean_value FLOAT,
-    std_dev FLOAT,
-    min_value FLOAT,
-    max_value FLOAT,
-    percentile_25 FLOAT,
-    percentile_50 FLOAT,
-    percentile_75 FLOAT,
+    mean_value REAL,
+    std_dev REAL,
+    min_value REAL,
+    max_value REAL,
+    percentile_25 REAL,
+    percentile_50 REAL,
+    percentile_75 REAL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create indexes
 CREATE INDEX idx_ensemble_stats_lat_lon ON ensemble_statistics(latitude, longitude);
-CREATE INDEX idx_ensemble_stats_run_var_hour ON ensemble_statistics(run_id, variable_id, forecast_hour);
+CREATE INDEX idx_es_run_var_hr ON ensemble_statistics(run_id, variable_id, forecast_hour)
+    INCLUDE (latitude, longitude, mean_value, std_dev);
 
 -- 6. Insert initial model metadata
 INSERT INTO models (model_name, ensemble_count, description) VALUES
@@ -0,0 +1,20 @@
+"""
+WSGI entry point for production serving:
+
+    gunicorn -w 4 -k gevent --worker-connections 20 -b 0.0.0.0:5000 wsgi:app
+
+psycopg2 is a C extension, so under gevent workers its socket waits would
+block the whole event loop. psycogreen installs a gevent-aware wait callback;
+it has to run before flask_api opens its connection pool.
+"""
+try:
+    from gevent import monkey
+    if monkey.is_module_patched('socket'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+except ImportError:  # sync / gthread workers don't need it
+    pass
+
+from flask_api import app, warmup  # noqa: E402
+
+warmup()